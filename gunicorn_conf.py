@@ -0,0 +1,43 @@
+"""Gunicorn configuration for the Railway deployment.
+
+All the heavy endpoints (/simulate, /test-strategies, /gantt-data,
+/gantt-image) are CPU-bound, so requests are served by pre-fork sync
+workers that can actually run in parallel across cores.
+"""
+import os
+
+# Railway injects $PORT
+bind = '0.0.0.0:%s' % os.environ.get('PORT', '5000')
+
+
+def _available_cpus():
+    """os.cpu_count() reports the host's cores, which on Railway can far
+    exceed the container's cgroup quota; prefer the quota when set."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+    return os.cpu_count() or 1
+
+
+# One worker per core rather than the classic 2*cores+1: each worker also
+# fans simulations out to its own lazily-created ProcessPoolExecutor, so
+# more workers than cores would oversubscribe the CPU under load.
+# WEB_CONCURRENCY overrides the count outright; either way it is exported
+# so app.py can size each worker's simulation pool as cores // workers,
+# keeping workers x pool close to the core budget instead of workers x
+# cores processes.
+workers = int(os.environ.get('WEB_CONCURRENCY') or 0) or max(2, _available_cpus())
+os.environ['WEB_CONCURRENCY'] = str(workers)
+worker_class = 'sync'
+
+# Import app.py (and the matplotlib/Agg setup) once in the master and share
+# the read-only module state with workers via copy-on-write. The simulation
+# pool is created lazily per worker, so nothing live crosses the fork.
+preload_app = True
+
+# Long multi-week Gantt renders can exceed the 30s default
+timeout = 120